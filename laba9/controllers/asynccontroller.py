@@ -0,0 +1,61 @@
+"""
+Асинхронный слой контроллеров.
+Блокирующие вызовы SQLite и получение курсов выполняются вне цикла
+событий в пуле потоков ограниченного размера.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .currencycontroller import CurrencyController
+from .databasecontroller import CurrencyRatesCRUD
+
+
+class AsyncCurrencyController:
+    """Асинхронная обертка над CurrencyController и CurrencyRatesCRUD"""
+
+    def __init__(self, currency_controller: CurrencyController,
+                 db_controller: CurrencyRatesCRUD, max_workers: int = 4):
+        self.currency = currency_controller
+        self.db = db_controller
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='db-worker')
+
+    async def _run(self, func, *args, **kwargs):
+        """Выполнение блокирующей функции в пуле потоков"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def get_all_currencies(self):
+        return await self._run(self.currency.get_all_currencies)
+
+    async def get_currency_by_id(self, currency_id: int):
+        return await self._run(self.currency.get_currency_by_id, currency_id)
+
+    async def get_currency_by_code(self, char_code: str):
+        return await self._run(self.currency.get_currency_by_code, char_code)
+
+    async def update_currency_value(self, char_code: str, value: float):
+        return await self._run(self.currency.update_currency_value, char_code, value)
+
+    async def delete_currency(self, currency_id: int):
+        return await self._run(self.currency.delete_currency, currency_id)
+
+    async def create_currency(self, num_code: str, char_code: str,
+                              name: str, value: float, nominal: int):
+        return await self._run(self.currency.create_currency,
+                               num_code, char_code, name, value, nominal)
+
+    async def read_users(self, user_id=None):
+        return await self._run(self.db._read_users, user_id)
+
+    async def read_user_currencies(self, user_id):
+        return await self._run(self.db._read_user_currencies, user_id)
+
+    async def fetch_rates(self, get_currencies, currency_list):
+        """Получение курсов из внешнего источника вне цикла событий"""
+        return await self._run(get_currencies, currency_list)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
@@ -4,27 +4,56 @@
 """
 
 from .databasecontroller import CurrencyRatesCRUD
+from utils.cache import TTLCache
 
 
 class CurrencyController:
     """Контроллер бизнес-логики для работы с валютами"""
 
-    def __init__(self, db_controller: CurrencyRatesCRUD):
+    def __init__(self, db_controller: CurrencyRatesCRUD, cache: TTLCache = None):
         self.db = db_controller
+        # Необязательный кэш чтения; записи в БД точечно сбрасывают его
+        # ключи: 'all', ('id', id), ('code', char_code)
+        self.cache = cache
+        if cache is not None:
+            self.db.add_listener(self._invalidate)
+
+    def _cached(self, key, loader):
+        if self.cache is None:
+            return loader()
+        return self.cache.get_or_load(key, loader)
+
+    def _invalidate(self, event):
+        """Сброс записей кэша, затронутых изменением в БД"""
+        keys = ['all']
+        for currency in event['currencies']:
+            keys.append(('id', currency['id']))
+            keys.append(('code', currency['char_code']))
+        self.cache.invalidate(*keys)
+
+    def cache_stats(self):
+        """Статистика кэша (None, если кэш отключен)"""
+        return self.cache.stats() if self.cache is not None else None
 
     def get_all_currencies(self):
         """Получение всех валют"""
-        return self.db._read()
+        return self._cached('all', self.db._read)
 
     def get_currency_by_id(self, currency_id: int):
         """Получение валюты по ID"""
-        result = self.db._read(currency_id=currency_id)
-        return result[0] if result else None
+        def load():
+            result = self.db._read(currency_id=currency_id)
+            return result[0] if result else None
+        return self._cached(('id', currency_id), load)
 
     def get_currency_by_code(self, char_code: str):
         """Получение валюты по символьному коду"""
-        result = self.db._read(char_code=char_code.upper())
-        return result[0] if result else None
+        char_code = char_code.upper()
+
+        def load():
+            result = self.db._read(char_code=char_code)
+            return result[0] if result else None
+        return self._cached(('code', char_code), load)
 
     def update_currency_value(self, char_code: str, value: float):
         """Обновление курса валюты с проверкой бизнес-правил"""
@@ -37,6 +66,21 @@ class CurrencyController:
 
         return self.db._update({char_code.upper(): value})
 
+    def update_currency_values(self, rates: dict):
+        """
+        Пакетное обновление курсов {char_code: value} одной транзакцией.
+        Возвращает список кодов, для которых валюта не найдена.
+        """
+        checked = {}
+        for char_code, value in rates.items():
+            if value <= 0:
+                raise ValueError(f"Курс валюты {char_code} должен быть положительным числом")
+            if len(char_code) != 3:
+                raise ValueError(f"Код валюты {char_code} должен состоять из 3 символов")
+            checked[char_code.upper()] = value
+
+        return self.db._update_many(checked)
+
     def delete_currency(self, currency_id: int):
         """Удаление валюты"""
         return self.db._delete(currency_id)
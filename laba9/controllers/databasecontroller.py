@@ -1,98 +1,161 @@
-import sqlite3
+import threading
+
+from .pool import ConnectionPool
+
+# Ограничение на число параметров в одном запросе SQLite
+SQL_VARIABLES_CHUNK = 500
 
 
 class CurrencyRatesCRUD:
     """Контроллер для CRUD операций с БД SQLite"""
 
-    def __init__(self):
-        self.__con = sqlite3.connect(':memory:')
+    def __init__(self, database: str = ':memory:', pool_size: int = 4):
+        # Каждое чтение получает свое соединение из пула,
+        # запись идет через одно соединение по очереди
+        self.__pool = ConnectionPool(database, size=pool_size)
+        # Подписчики на изменения таблицы currency (кэши и т.п.)
+        self.__listeners = []
+        self.__version_lock = threading.Lock()
+        self.version = 0
         self.__createtable()
-        self.__cursor = self.__con.cursor()
         self.__seed_data()
 
     def __createtable(self):
         """Создание таблиц с первичными и внешними ключами"""
         # PRIMARY KEY - уникальный идентификатор записи
         # FOREIGN KEY - ссылка на запись в другой таблице
-        self.__con.execute(
-            "CREATE TABLE IF NOT EXISTS currency("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-            "num_code TEXT NOT NULL, "
-            "char_code TEXT NOT NULL UNIQUE, "
-            "name TEXT NOT NULL, "
-            "value FLOAT, "
-            "nominal INTEGER);")
-
-        self.__con.execute(
-            "CREATE TABLE IF NOT EXISTS user("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-            "name TEXT NOT NULL);")
-
-        self.__con.execute(
-            "CREATE TABLE IF NOT EXISTS user_currency("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-            "user_id INTEGER NOT NULL, "
-            "currency_id INTEGER NOT NULL, "
-            "FOREIGN KEY(user_id) REFERENCES user(id), "
-            "FOREIGN KEY(currency_id) REFERENCES currency(id));")
-
-        self.__con.commit()
+        with self.__pool.writer() as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS currency("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "num_code TEXT NOT NULL, "
+                "char_code TEXT NOT NULL UNIQUE, "
+                "name TEXT NOT NULL, "
+                "value FLOAT, "
+                "nominal INTEGER);")
+
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS user("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "name TEXT NOT NULL);")
+
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS user_currency("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "user_id INTEGER NOT NULL, "
+                "currency_id INTEGER NOT NULL, "
+                "FOREIGN KEY(user_id) REFERENCES user(id), "
+                "FOREIGN KEY(currency_id) REFERENCES currency(id));")
 
     def __seed_data(self):
         """Начальное заполнение БД тестовыми данными"""
-        # Валюты
-        data = [
-            {"num_code": "840", "char_code": "USD", "name": "Доллар США", "value": 90.0, "nominal": 1},
-            {"num_code": "978", "char_code": "EUR", "name": "Евро", "value": 91.0, "nominal": 1},
-            {"num_code": "826", "char_code": "GBP", "name": "Фунт стерлингов", "value": 105.0, "nominal": 1}
-        ]
-
-        sql = """INSERT OR IGNORE INTO currency 
-                 (num_code, char_code, name, value, nominal) 
-                 VALUES(:num_code, :char_code, :name, :value, :nominal)"""
-        self.__cursor.executemany(sql, data)
-
-        # Пользователи
-        users = [{"name": "Иван"}, {"name": "Мария"}, {"name": "Алексей"}]
-        self.__cursor.executemany("INSERT OR IGNORE INTO user(name) VALUES(:name)", users)
-
-        # Подписки
-        subscriptions = [
-            {"user_id": 1, "currency_id": 1},
-            {"user_id": 1, "currency_id": 2},
-            {"user_id": 2, "currency_id": 2},
-            {"user_id": 3, "currency_id": 1}
-        ]
-        self.__cursor.executemany(
-            "INSERT OR IGNORE INTO user_currency(user_id, currency_id) VALUES(:user_id, :currency_id)",
-            subscriptions
-        )
-
-        self.__con.commit()
+        with self.__pool.writer() as con:
+            # Файловая БД может быть уже заполнена (перезапуск, другой воркер)
+            con.execute("BEGIN IMMEDIATE")
+            if con.execute("SELECT 1 FROM user LIMIT 1").fetchone():
+                return
+
+            # Валюты
+            data = [
+                {"num_code": "840", "char_code": "USD", "name": "Доллар США", "value": 90.0, "nominal": 1},
+                {"num_code": "978", "char_code": "EUR", "name": "Евро", "value": 91.0, "nominal": 1},
+                {"num_code": "826", "char_code": "GBP", "name": "Фунт стерлингов", "value": 105.0, "nominal": 1}
+            ]
+
+            sql = """INSERT OR IGNORE INTO currency
+                     (num_code, char_code, name, value, nominal)
+                     VALUES(:num_code, :char_code, :name, :value, :nominal)"""
+            con.executemany(sql, data)
+
+            # Пользователи
+            users = [{"name": "Иван"}, {"name": "Мария"}, {"name": "Алексей"}]
+            con.executemany("INSERT OR IGNORE INTO user(name) VALUES(:name)", users)
+
+            # Подписки
+            subscriptions = [
+                {"user_id": 1, "currency_id": 1},
+                {"user_id": 1, "currency_id": 2},
+                {"user_id": 2, "currency_id": 2},
+                {"user_id": 3, "currency_id": 1}
+            ]
+            con.executemany(
+                "INSERT OR IGNORE INTO user_currency(user_id, currency_id) VALUES(:user_id, :currency_id)",
+                subscriptions
+            )
+
+    def add_listener(self, callback):
+        """
+        Подписка на изменения валют. После фиксации транзакции callback
+        получает событие {'op': 'create'|'update'|'delete', 'currencies': [...]},
+        где currencies - затронутые записи (для delete - до удаления).
+        """
+        self.__listeners.append(callback)
+
+    def __notify(self, op, rows):
+        if not rows:
+            return
+        with self.__version_lock:
+            self.version += 1
+            version = self.version
+        event = {'op': op, 'currencies': [self.__currency_dict(r) for r in rows],
+                 'version': version}
+        for callback in self.__listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Ошибка обработчика изменений: {e}")
+
+    @staticmethod
+    def __currency_dict(_row):
+        return {
+            'id': int(_row[0]),
+            'num_code': _row[1],
+            'char_code': _row[2],
+            'name': _row[3],
+            'value': float(_row[4]),
+            'nominal': int(_row[5])
+        }
+
+    def __select_by_codes(self, con, codes):
+        """Записи валют по списку кодов (частями, чтобы не превысить лимит параметров)"""
+        rows = []
+        for start in range(0, len(codes), SQL_VARIABLES_CHUNK):
+            chunk = codes[start:start + SQL_VARIABLES_CHUNK]
+            placeholders = ', '.join('?' * len(chunk))
+            rows.extend(con.execute(
+                f"SELECT * FROM currency WHERE char_code IN ({placeholders})", chunk))
+        return rows
+
+    def pool_stats(self) -> dict:
+        """Статистика пула соединений (выдачи, время ожидания)"""
+        return self.__pool.stats()
 
     # CRUD операции (только работа с БД, без бизнес-логики)
     def _create(self, data):
         """Create - добавление записей в БД"""
-        sql = """INSERT INTO currency 
-                 (num_code, char_code, name, value, nominal) 
+        sql = """INSERT INTO currency
+                 (num_code, char_code, name, value, nominal)
                  VALUES(:num_code, :char_code, :name, :value, :nominal)"""
-        self.__cursor.executemany(sql, data)
-        self.__con.commit()
+        with self.__pool.writer() as con:
+            con.executemany(sql, data)
+            rows = self.__select_by_codes(con, [d['char_code'] for d in data])
+        self.__notify('create', rows)
 
     def _read(self, currency_id=None, char_code=None):
         """Read - чтение записей из БД с параметризованными запросами"""
-        if currency_id:
-            sql = "SELECT * FROM currency WHERE id = ?"
-            self.__cursor.execute(sql, (currency_id,))
-        elif char_code:
-            sql = "SELECT * FROM currency WHERE char_code = ?"
-            self.__cursor.execute(sql, (char_code,))
-        else:
-            sql = "SELECT * FROM currency ORDER BY char_code"
-            self.__cursor.execute(sql)
+        with self.__pool.connection() as con:
+            if currency_id:
+                sql = "SELECT * FROM currency WHERE id = ?"
+                rows = con.execute(sql, (currency_id,)).fetchall()
+            elif char_code:
+                sql = "SELECT * FROM currency WHERE char_code = ?"
+                rows = con.execute(sql, (char_code,)).fetchall()
+            else:
+                sql = "SELECT * FROM currency ORDER BY char_code"
+                rows = con.execute(sql).fetchall()
 
         result_data = []
-        for _row in self.__cursor.fetchall():
+        for _row in rows:
             _d = {
                 'id': int(_row[0]),
                 'num_code': _row[1],
@@ -106,29 +169,46 @@ class CurrencyRatesCRUD:
 
     def _update(self, currency: dict):
         """Update - обновление записи в БД с параметризованным запросом"""
-        currency_code = tuple(currency.keys())[0]
-        currency_value = tuple(currency.values())[0]
+        return self._update_many(currency)
+
+    def _update_many(self, rates: dict):
+        """
+        Пакетное обновление курсов {char_code: value} одной транзакцией.
+
+        returns:
+            список кодов, для которых не нашлось записи в БД
+        """
+        if not rates:
+            return []
+        codes = list(rates)
         sql = "UPDATE currency SET value = ? WHERE char_code = ?"
-        self.__cursor.execute(sql, (currency_value, currency_code))
-        self.__con.commit()
+        with self.__pool.writer() as con:
+            found = {row[2]: row for row in self.__select_by_codes(con, codes)}
+            con.executemany(sql, ((value, code) for code, value in rates.items() if code in found))
+        rows = [row[:4] + (rates[code],) + row[5:] for code, row in found.items()]
+        self.__notify('update', rows)
+        return [code for code in codes if code not in found]
 
     def _delete(self, currency_id: int):
         """Delete - удаление записи из БД с параметризованным запросом"""
         sql = "DELETE FROM currency WHERE id = ?"
-        self.__cursor.execute(sql, (currency_id,))
-        self.__con.commit()
+        with self.__pool.writer() as con:
+            rows = con.execute("SELECT * FROM currency WHERE id = ?", (currency_id,)).fetchall()
+            con.execute(sql, (currency_id,))
+        self.__notify('delete', rows)
 
     def _read_users(self, user_id=None):
         """Чтение пользователей из БД"""
-        if user_id:
-            sql = "SELECT * FROM user WHERE id = ?"
-            self.__cursor.execute(sql, (user_id,))
-        else:
-            sql = "SELECT * FROM user ORDER BY id"
-            self.__cursor.execute(sql)
+        with self.__pool.connection() as con:
+            if user_id:
+                sql = "SELECT * FROM user WHERE id = ?"
+                rows = con.execute(sql, (user_id,)).fetchall()
+            else:
+                sql = "SELECT * FROM user ORDER BY id"
+                rows = con.execute(sql).fetchall()
 
         result_data = []
-        for _row in self.__cursor.fetchall():
+        for _row in rows:
             _d = {'id': int(_row[0]), 'name': _row[1]}
             result_data.append(_d)
         return result_data
@@ -140,10 +220,11 @@ class CurrencyRatesCRUD:
             JOIN user_currency uc ON c.id = uc.currency_id
             WHERE uc.user_id = ?
         '''
-        self.__cursor.execute(sql, (user_id,))
+        with self.__pool.connection() as con:
+            rows = con.execute(sql, (user_id,)).fetchall()
 
         result_data = []
-        for _row in self.__cursor.fetchall():
+        for _row in rows:
             _d = {
                 'id': int(_row[0]),
                 'num_code': _row[1],
@@ -155,9 +236,12 @@ class CurrencyRatesCRUD:
             result_data.append(_d)
         return result_data
 
+    def close(self):
+        """Закрытие всех соединений пула"""
+        self.__pool.close()
+
     def __del__(self):
-        """Деструктор - закрытие соединения с БД"""
-        if hasattr(self, '__cursor'):
-            self.__cursor = None
-        if hasattr(self, '__con'):
-            self.__con.close()
\ No newline at end of file
+        """Деструктор - закрытие соединений с БД"""
+        pool = getattr(self, '_CurrencyRatesCRUD__pool', None)
+        if pool is not None:
+            pool.close()
@@ -3,14 +3,68 @@
 Отделяет логику рендеринга от бизнес-логики и маршрутизации.
 """
 
+import hashlib
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
 from jinja2 import Environment
 
 
+class RenderedPage:
+    """Готовый ответ: тело страницы, строгий ETag и время изменения"""
+
+    def __init__(self, body: bytes, version, last_modified: float = None):
+        self.body = body
+        self.version = version
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.last_modified = int(last_modified if last_modified is not None else time.time())
+
+    @property
+    def last_modified_header(self) -> str:
+        return formatdate(self.last_modified, usegmt=True)
+
+    def not_modified(self, if_none_match: str = None, if_modified_since: str = None) -> bool:
+        """Проверка условного запроса: можно ли ответить 304 Not Modified"""
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or self.etag in tags
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified <= since
+        return False
+
+
 class PagesController:
     """Контроллер для рендеринга HTML страниц"""
 
     def __init__(self, env: Environment):
         self.env = env
+        # Кэш готовых страниц: имя страницы -> RenderedPage последней версии данных
+        self.__pages = {}
+        self.__pages_lock = threading.Lock()
+
+    def get_page(self, name: str, version):
+        """Готовая страница для данной версии данных или None"""
+        page = self.__pages.get(name)
+        if page is not None and page.version == version:
+            return page
+        return None
+
+    def store_page(self, name: str, version, html: str) -> RenderedPage:
+        """Сохранение отрендеренной страницы для версии данных"""
+        body = html.encode('utf-8')
+        with self.__pages_lock:
+            previous = self.__pages.get(name)
+            page = RenderedPage(body, version)
+            if previous is not None and previous.etag == page.etag:
+                # Данные изменились, а страница нет: время изменения прежнее
+                page.last_modified = previous.last_modified
+            self.__pages[name] = page
+        return page
 
     def render_index(self, author_name: str, group: str, currencies):
         """Рендеринг главной страницы"""
@@ -41,6 +95,19 @@ class PagesController:
             group=group
         )
 
+    def render_users(self, author_name: str, group: str, users,
+                     current_user=None, user_currencies=None):
+        """Рендеринг страницы пользователей (и подписок выбранного пользователя)"""
+        template = self.env.get_template("users.html")
+        return template.render(
+            myapp="CurrenciesListApp",
+            author_name=author_name,
+            group=group,
+            users=users,
+            current_user=current_user,
+            user_currencies=user_currencies or []
+        )
+
     def render_error(self, message: str):
         """Рендеринг страницы ошибки"""
         error_html = f"""
@@ -0,0 +1,129 @@
+"""
+Пул соединений SQLite.
+
+Читатели получают собственные соединения из пула и работают параллельно
+(для файловой БД в режиме WAL). Запись идет через одно выделенное
+соединение и сериализуется блокировкой.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """Не удалось получить соединение из пула за отведенное время"""
+
+
+class ConnectionPool:
+    """Пул соединений для чтения и одно соединение для записи"""
+
+    def __init__(self, database: str = ':memory:', size: int = 4, timeout: float = 5.0):
+        if size < 1:
+            raise ValueError("Размер пула должен быть положительным")
+        self.size = size
+        self.timeout = timeout
+
+        # ':memory:' у каждого соединения своя; чтобы пул видел одну БД,
+        # используется именованная БД в памяти с общим кэшем
+        self.memory = database == ':memory:'
+        if self.memory:
+            self.database = f"file:laba9-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        else:
+            self.database = database
+
+        self.__idle = queue.LifoQueue()
+        self.__created = 0
+        self.__create_lock = threading.Lock()
+        self.__write_lock = threading.Lock()
+        self.__stats_lock = threading.Lock()
+        self.__checkouts = 0
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+        self.__timeouts = 0
+
+        # Соединение записи держит БД в памяти живой все время работы пула
+        self.__writer = self._connect()
+        if not self.memory:
+            self.__writer.execute("PRAGMA journal_mode=WAL")
+            self.__writer.execute("PRAGMA synchronous=NORMAL")
+
+    def _connect(self):
+        con = sqlite3.connect(self.database, uri=self.memory,
+                              check_same_thread=False, timeout=self.timeout)
+        if self.memory:
+            # Читатели общего кэша не блокируют таблицы для писателя
+            con.execute("PRAGMA read_uncommitted = 1")
+        return con
+
+    def _checkout(self):
+        started = time.perf_counter()
+        try:
+            con = self.__idle.get_nowait()
+        except queue.Empty:
+            con = None
+            with self.__create_lock:
+                if self.__created < self.size:
+                    self.__created += 1
+                    con = self._connect()
+            if con is None:
+                try:
+                    con = self.__idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self.__stats_lock:
+                        self.__timeouts += 1
+                    raise PoolTimeout("Нет свободных соединений в пуле")
+
+        waited = time.perf_counter() - started
+        with self.__stats_lock:
+            self.__checkouts += 1
+            self.__wait_total += waited
+            self.__wait_max = max(self.__wait_max, waited)
+        return con
+
+    @contextmanager
+    def connection(self):
+        """Соединение для чтения из пула"""
+        con = self._checkout()
+        try:
+            yield con
+        finally:
+            if con.in_transaction:
+                con.rollback()
+            self.__idle.put(con)
+
+    @contextmanager
+    def writer(self):
+        """Соединение для записи: одна транзакция, писатели по очереди"""
+        with self.__write_lock:
+            try:
+                yield self.__writer
+                self.__writer.commit()
+            except BaseException:
+                self.__writer.rollback()
+                raise
+
+    def stats(self) -> dict:
+        """Статистика пула: выдачи соединений и время ожидания"""
+        with self.__stats_lock:
+            return {
+                'size': self.size,
+                'created': self.__created,
+                'idle': self.__idle.qsize(),
+                'checkouts': self.__checkouts,
+                'wait_total': self.__wait_total,
+                'wait_avg': self.__wait_total / self.__checkouts if self.__checkouts else 0.0,
+                'wait_max': self.__wait_max,
+                'timeouts': self.__timeouts,
+            }
+
+    def close(self):
+        while True:
+            try:
+                self.__idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self.__writer.close()
@@ -3,36 +3,93 @@
 Реализует MVC архитектуру с полным разделением ответственности.
 """
 
+import argparse
 from jinja2 import Environment, PackageLoader, select_autoescape
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from utils.currencies_api import get_currencies
+from utils.server import serve, SERVE_MODES
+from utils.cache import TTLCache
+from utils import aioserver
+from utils.aioserver import Response
 from controllers.databasecontroller import CurrencyRatesCRUD
 from controllers.currencycontroller import CurrencyController
+from controllers.asynccontroller import AsyncCurrencyController
 from controllers.pages import PagesController
 from models import Author, App
 
 # Инициализация Jinja2 Environment
 env = Environment(loader=PackageLoader("laba9"), autoescape=select_autoescape())
 
-# Создание контроллеров
-db_controller = CurrencyRatesCRUD()
-currency_controller = CurrencyController(db_controller)
-pages_controller = PagesController(env)  # Без currency_controller!
-
 # Данные приложения
 author = Author('Прозорова Полина', 'P3120')
 app = App("CurrenciesListApp", "1.0", author)
 
-# Начальное обновление курсов из API
-currency_list = ['USD', 'EUR', 'GBP']
-data = get_currencies(currency_list)
-for code, value in data.items():
+# Контроллеры создаются в init_controllers(): в режиме prefork
+# у каждого процесса-воркера свое соединение с БД
+db_controller = None
+currency_controller = None
+pages_controller = None
+async_controller = None
+
+# Параметры БД задаются из командной строки до запуска воркеров
+db_config = {'database': ':memory:', 'pool_size': 4}
+cache_config = {'maxsize': 256, 'ttl': 30.0}
+
+API_CURRENCIES = ['USD', 'EUR', 'GBP']
+EDITABLE_CURRENCIES = ['USD', 'EUR', 'GBP', 'CNY', 'JPY', 'CHF', 'TRY', 'KZT']
+
+
+def init_controllers():
+    """Создание контроллеров и начальное обновление курсов из API"""
+    global db_controller, currency_controller, pages_controller
+    db_controller = CurrencyRatesCRUD(**db_config)
+    currency_controller = CurrencyController(db_controller, cache=TTLCache(**cache_config))
+    pages_controller = PagesController(env)  # Без currency_controller!
+
+    # Начальное обновление курсов из API
+    apply_api_rates(get_currencies(API_CURRENCIES))
+
+
+async def init_async_controllers():
+    """Инициализация для режима asyncio: синхронные контроллеры и асинхронная обертка"""
+    global async_controller
+    init_controllers()
+    async_controller = AsyncCurrencyController(currency_controller, db_controller)
+
+
+def apply_api_rates(data):
+    """Запись курсов, полученных из API, в БД одной транзакцией"""
+    rates = {}
+    for code, value in data.items():
+        try:
+            rates[code] = float(value.replace(',', '.'))
+        except ValueError as e:
+            print(f"Ошибка обновления {code}: {e}")
+    apply_rates(rates)
+
+
+def apply_rates(rates):
+    """Пакетное обновление курсов с выводом ошибок"""
     try:
-        new_value = float(value.replace(',', '.'))
-        currency_controller.update_currency_value(code, new_value)
+        missing = currency_controller.update_currency_values(rates)
     except ValueError as e:
-        print(f"Ошибка обновления {code}: {e}")
+        print(f"Ошибка обновления курсов: {e}")
+        return
+    if missing:
+        print(f"Валюты не найдены: {', '.join(missing)}")
+
+
+def parse_rate_params(params):
+    """Курсы из GET-параметров вида USD=95.5 для разрешенных валют"""
+    rates = {}
+    for key, value in params.items():
+        if key.upper() in EDITABLE_CURRENCIES:
+            try:
+                rates[key.upper()] = float(value[0])
+            except (ValueError, KeyError) as e:
+                print(f"Ошибка обновления {key}: {e}")
+    return rates
 
 
 class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
@@ -45,15 +102,17 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
 
         try:
             if path == '/':
-                currencies = currency_controller.get_all_currencies()
-                html = pages_controller.render_index(author.name, author.group, currencies)
+                self.send_cached_page('index', lambda: pages_controller.render_index(
+                    author.name, author.group, currency_controller.get_all_currencies()))
+                return
 
             elif path == '/author':
                 html = pages_controller.render_author(author.name, author.group)
 
             elif path == '/currencies':
-                currencies = currency_controller.get_all_currencies()
-                html = pages_controller.render_currencies(author.name, author.group, currencies)
+                self.send_cached_page('currencies', lambda: pages_controller.render_currencies(
+                    author.name, author.group, currency_controller.get_all_currencies()))
+                return
 
             elif path == '/users':
                 html = self.handle_users_page()
@@ -103,42 +162,45 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(html.encode('utf-8'))
 
+    def send_cached_page(self, name, render):
+        """Отправка страницы из кэша по версии данных с поддержкой ETag / 304"""
+        version = db_controller.version
+        page = pages_controller.get_page(name, version)
+        if page is None:
+            page = pages_controller.store_page(name, version, render())
+
+        if page.not_modified(self.headers.get('If-None-Match'),
+                             self.headers.get('If-Modified-Since')):
+            self.send_response(304)
+            self.send_header('ETag', page.etag)
+            self.send_header('Last-Modified', page.last_modified_header)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(page.body)))
+        self.send_header('ETag', page.etag)
+        self.send_header('Last-Modified', page.last_modified_header)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(page.body)
+
     def handle_users_page(self):
-        template = env.get_template("users.html")
         users = db_controller._read_users()
-        return template.render(
-            myapp="CurrenciesListApp",
-            author_name=author.name,
-            group=author.group,
-            users=users,
-            current_user=None,
-            user_currencies=[]
-        )
+        return pages_controller.render_users(author.name, author.group, users)
 
     def handle_user_page(self, user_id):
-        template = env.get_template("users.html")
         users = db_controller._read_users()
         current_user = next((u for u in users if u['id'] == user_id), None)
         if not current_user and users:
             current_user = users[0]
         user_currencies = db_controller._read_user_currencies(user_id)
-        return template.render(
-            myapp="CurrenciesListApp",
-            author_name=author.name,
-            group=author.group,
-            users=users,
-            current_user=current_user,
-            user_currencies=user_currencies
-        )
+        return pages_controller.render_users(author.name, author.group, users,
+                                             current_user, user_currencies)
 
     def handle_currency_update(self, params):
-        for key, value in params.items():
-            if key.upper() in ['USD', 'EUR', 'GBP', 'CNY', 'JPY', 'CHF', 'TRY', 'KZT']:
-                try:
-                    new_value = float(value[0])
-                    currency_controller.update_currency_value(key.upper(), new_value)
-                except (ValueError, KeyError) as e:
-                    print(f"Ошибка обновления {key}: {e}")
+        apply_rates(parse_rate_params(params))
 
     def handle_currency_create(self, params):
         """Обработка создания новой валюты через GET-параметры"""
@@ -163,14 +225,7 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
             print(f"{formatted['code']}: {formatted['value']} руб.")
 
     def update_from_api(self):
-        currency_list = ['USD', 'EUR', 'GBP']
-        data = get_currencies(currency_list)
-        for code, value in data.items():
-            try:
-                new_value = float(value.replace(',', '.'))
-                currency_controller.update_currency_value(code, new_value)
-            except ValueError as e:
-                print(f"Ошибка обновления {code}: {e}")
+        apply_api_rates(get_currencies(API_CURRENCIES))
 
     def send_redirect(self, location):
         self.send_response(302)
@@ -178,6 +233,125 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
 
-http = HTTPServer(('localhost', 8080), SimpleHTTPRequestHandler)
-print('Сервер запущен на http://localhost:8080')
-http.serve_forever()
\ No newline at end of file
+async def cached_page_response(request, name, render):
+    """Страница со списком валют из кэша по версии данных с поддержкой ETag / 304"""
+    version = db_controller.version
+    page = pages_controller.get_page(name, version)
+    if page is None:
+        currencies = await async_controller.get_all_currencies()
+        page = pages_controller.store_page(
+            name, version, render(author.name, author.group, currencies))
+
+    headers = {'ETag': page.etag, 'Last-Modified': page.last_modified_header}
+    if page.not_modified(request.headers.get('if-none-match'),
+                         request.headers.get('if-modified-since')):
+        return Response(304, headers=headers)
+    headers['Cache-Control'] = 'no-cache'
+    return Response(200, page.body, headers)
+
+
+async def async_app(request):
+    """Маршрутизация для режима asyncio (те же маршруты, что и do_GET)"""
+    path = request.path
+    params = request.params
+
+    try:
+        if path == '/':
+            return await cached_page_response(request, 'index', pages_controller.render_index)
+
+        elif path == '/author':
+            html = pages_controller.render_author(author.name, author.group)
+
+        elif path == '/currencies':
+            return await cached_page_response(request, 'currencies',
+                                              pages_controller.render_currencies)
+
+        elif path == '/users':
+            users = await async_controller.read_users()
+            html = pages_controller.render_users(author.name, author.group, users)
+
+        elif path == '/user':
+            user_id = int(params.get('id', [1])[0])
+            users = await async_controller.read_users()
+            current_user = next((u for u in users if u['id'] == user_id), None)
+            if not current_user and users:
+                current_user = users[0]
+            user_currencies = await async_controller.read_user_currencies(user_id)
+            html = pages_controller.render_users(author.name, author.group, users,
+                                                 current_user, user_currencies)
+
+        elif 'currency/delete' in path:
+            if 'id' in params:
+                await async_controller.delete_currency(int(params['id'][0]))
+            return Response.redirect('/currencies')
+
+        elif 'currency/update' in path:
+            await async_controller._run(apply_rates, parse_rate_params(params))
+            return Response.redirect('/currencies')
+
+        elif 'currency/create' in path:
+            try:
+                await async_controller.create_currency(
+                    num_code=params['num_code'][0],
+                    char_code=params['char_code'][0],
+                    name=params['name'][0],
+                    value=float(params['value'][0]),
+                    nominal=int(params['nominal'][0])
+                )
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"Ошибка создания валюты: {e}")
+            return Response.redirect('/currencies')
+
+        elif 'currency/show' in path:
+            currencies = await async_controller.get_all_currencies()
+            print("Текущие курсы валют:")
+            for currency in currencies:
+                formatted = currency_controller.format_currency_for_display(currency)
+                print(f"{formatted['code']}: {formatted['value']} руб.")
+            html = "<h1>Данные выведены в консоль</h1>"
+
+        elif path == '/currencies/update':
+            data = await async_controller.fetch_rates(get_currencies, API_CURRENCIES)
+            await async_controller._run(apply_api_rates, data)
+            return Response.redirect('/currencies')
+
+        else:
+            html = pages_controller.render_error("Страница не найдена")
+
+        return Response.html(html)
+
+    except Exception as e:
+        return Response.html(pages_controller.render_error(f"Ошибка: {str(e)}"), status=500)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CurrenciesListApp")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--mode', choices=SERVE_MODES + ('asyncio',), default='threaded',
+                        help="режим обслуживания запросов")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="число потоков (threaded) или процессов (prefork)")
+    parser.add_argument('--db', default=':memory:',
+                        help="путь к файлу БД (по умолчанию БД в памяти)")
+    parser.add_argument('--pool-size', type=int, default=4,
+                        help="число соединений для чтения в пуле")
+    parser.add_argument('--cache-ttl', type=float, default=30.0,
+                        help="время жизни записей кэша валют, сек")
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help="максимальное число записей кэша валют")
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    db_config.update(database=args.db, pool_size=args.pool_size)
+    cache_config.update(maxsize=args.cache_size, ttl=args.cache_ttl)
+    if args.mode == 'prefork' and args.db == ':memory:':
+        print("Внимание: в режиме prefork с БД в памяти у каждого процесса свои данные")
+    if args.mode == 'asyncio':
+        aioserver.run(async_app, host=args.host, port=args.port,
+                      on_startup=init_async_controllers)
+    else:
+        serve(SimpleHTTPRequestHandler, host=args.host, port=args.port,
+              mode=args.mode, workers=args.workers, on_worker_start=init_controllers)
@@ -0,0 +1,66 @@
+import unittest
+from controllers.currencycontroller import CurrencyController
+from controllers.databasecontroller import CurrencyRatesCRUD
+from utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    """Тесты кэша с TTL и LRU-вытеснением"""
+
+    def test_ttl_and_lru(self):
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)  # вытесняется 'b', к 'a' обращались позже
+        self.assertIsNone(cache.get('b'))
+        clock.now = 11
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+
+class TestCurrencyControllerCache(unittest.TestCase):
+    """Кэш чтения валют и его сброс при записи"""
+
+    def setUp(self):
+        self.db = CurrencyRatesCRUD()
+        self.controller = CurrencyController(self.db, cache=TTLCache())
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_hits_and_invalidation(self):
+        self.controller.get_all_currencies()
+        self.controller.get_currency_by_code('EUR')
+        usd = self.controller.get_currency_by_code('usd')
+        self.controller.get_all_currencies()
+        self.assertEqual(self.controller.cache_stats()['hits'], 1)
+
+        self.controller.update_currency_value('USD', 99.0)
+        # Сброшены только записи, затронутые изменением
+        self.assertEqual(self.controller.get_currency_by_code('USD')['value'], 99.0)
+        self.controller.get_currency_by_code('EUR')
+        stats = self.controller.cache_stats()
+        self.assertEqual(stats['hits'], 2)
+
+        self.controller.delete_currency(usd['id'])
+        self.assertIsNone(self.controller.get_currency_by_code('USD'))
+        self.assertEqual(len(self.controller.get_all_currencies()), 2)
+
+    def test_create_drops_negative_entry(self):
+        self.assertIsNone(self.controller.get_currency_by_code('CNY'))
+        self.controller.create_currency('156', 'CNY', 'Юань', 12.8, 1)
+        self.assertEqual(self.controller.get_currency_by_code('CNY')['name'], 'Юань')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,16 @@ class TestCurrencyController(unittest.TestCase):
         controller.update_currency_value("USD", 95.5)
         mock_db._update.assert_called_once_with({"USD": 95.5})
 
+    def test_update_currency_values(self):
+        mock_db = MagicMock()
+        mock_db._update_many.return_value = ['XXX']
+        controller = CurrencyController(mock_db)
+        missing = controller.update_currency_values({"usd": 95.5, "XXX": 1.0})
+        self.assertEqual(missing, ['XXX'])
+        mock_db._update_many.assert_called_once_with({"USD": 95.5, "XXX": 1.0})
+        with self.assertRaises(ValueError):
+            controller.update_currency_values({"USD": -1})
+
     def test_delete_currency(self):
         mock_db = MagicMock()
         controller = CurrencyController(mock_db)
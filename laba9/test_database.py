@@ -0,0 +1,62 @@
+import os
+import tempfile
+import threading
+import unittest
+from controllers.databasecontroller import CurrencyRatesCRUD
+
+
+class TestCurrencyRatesCRUD(unittest.TestCase):
+    """Тесты CurrencyRatesCRUD на реальной БД SQLite"""
+
+    def setUp(self):
+        self.db = CurrencyRatesCRUD(pool_size=2)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_seed_and_read(self):
+        codes = [c['char_code'] for c in self.db._read()]
+        self.assertEqual(codes, ['EUR', 'GBP', 'USD'])
+        self.assertEqual(len(self.db._read_user_currencies(1)), 2)
+
+    def test_update_many_reports_missing(self):
+        missing = self.db._update_many({'USD': 95.0, 'EUR': 99.0, 'XXX': 1.0})
+        self.assertEqual(missing, ['XXX'])
+        rates = {c['char_code']: c['value'] for c in self.db._read()}
+        self.assertEqual(rates, {'EUR': 99.0, 'GBP': 105.0, 'USD': 95.0})
+
+    def test_concurrent_reads(self):
+        errors = []
+
+        def reader():
+            try:
+                for _ in range(50):
+                    self.assertEqual(len(self.db._read()), 3)
+                    self.assertEqual(len(self.db._read_users()), 3)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for _ in range(20):
+            self.db._update({'USD': 95.0})
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        stats = self.db.pool_stats()
+        self.assertLessEqual(stats['created'], 2)
+        self.assertGreaterEqual(stats['checkouts'], 400)
+
+    def test_file_database_is_seeded_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rates.db')
+            CurrencyRatesCRUD(path).close()
+            db = CurrencyRatesCRUD(path)
+            self.assertEqual(len(db._read_users()), 3)
+            db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Асинхронный HTTP/1.1 сервер на asyncio с поддержкой keep-alive.
+
+Сервер только разбирает запросы и пишет ответы; маршрутизация
+выполняется переданной корутиной app(request) -> Response.
+Простаивающие keep-alive соединения стоят одну корутину, без потока.
+"""
+
+import asyncio
+from http import HTTPStatus
+from urllib.parse import urlparse, parse_qs
+
+MAX_HEADER_SIZE = 64 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class Request:
+    """Разобранный HTTP-запрос"""
+
+    def __init__(self, method: str, target: str, version: str, headers: dict, body: bytes = b''):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+        parsed = urlparse(target)
+        self.path = parsed.path
+        self.params = parse_qs(parsed.query)
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+
+class Response:
+    """HTTP-ответ: статус, заголовки и тело"""
+
+    def __init__(self, status: int = 200, body: bytes = b'', headers: dict = None,
+                 content_type: str = 'text/html; charset=utf-8'):
+        self.status = status
+        self.body = body
+        self.headers = dict(headers or {})
+        if body or status == 200:
+            self.headers.setdefault('Content-Type', content_type)
+
+    @classmethod
+    def html(cls, html: str, status: int = 200):
+        return cls(status, html.encode('utf-8'))
+
+    @classmethod
+    def redirect(cls, location: str):
+        return cls(302, headers={'Location': location})
+
+
+class AsyncHTTPServer:
+    """HTTP/1.1 сервер, обслуживающий все соединения в одном цикле событий"""
+
+    def __init__(self, app, host='localhost', port=8080, keep_alive_timeout=75.0):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port,
+            limit=MAX_HEADER_SIZE)
+        return self._server
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        self._read_request(reader), self.keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError,
+                        asyncio.LimitOverrunError, ConnectionError):
+                    break
+                except ValueError:
+                    await self._write_response(writer, Response(400), keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                try:
+                    response = await self.app(request)
+                except Exception as e:
+                    print(f"Ошибка обработки {request.path}: {e}")
+                    response = Response(500)
+
+                keep_alive = request.keep_alive
+                await self._write_response(writer, response, keep_alive,
+                                           head_only=request.method == 'HEAD')
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader):
+        """Чтение строки запроса, заголовков и тела (по Content-Length)"""
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode('latin-1').strip().split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+            raise ValueError("Некорректная строка запроса")
+        method, target, version = parts
+
+        headers = {}
+        size = len(line)
+        while True:
+            line = await reader.readline()
+            size += len(line)
+            if size > MAX_HEADER_SIZE:
+                raise ValueError("Слишком большие заголовки")
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        body = b''
+        length = int(headers.get('content-length', 0) or 0)
+        if length:
+            if length > MAX_BODY_SIZE:
+                raise ValueError("Слишком большое тело запроса")
+            body = await reader.readexactly(length)
+        return Request(method, target, version, headers, body)
+
+    async def _write_response(self, writer, response, keep_alive, head_only=False):
+        reason = HTTPStatus(response.status).phrase
+        headers = dict(response.headers)
+        headers['Content-Length'] = str(len(response.body))
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        head = f"HTTP/1.1 {response.status} {reason}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n')
+        if not head_only:
+            writer.write(response.body)
+        await writer.drain()
+
+
+def run(app, host='localhost', port=8080, on_startup=None):
+    """Запуск асинхронного сервера до прерывания"""
+    async def main():
+        if on_startup:
+            await on_startup()
+        server = AsyncHTTPServer(app, host, port)
+        await server.start()
+        print(f'Сервер запущен на http://{host}:{port} (режим asyncio)')
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
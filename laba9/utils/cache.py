@@ -0,0 +1,97 @@
+"""
+Потокобезопасный кэш в памяти с временем жизни записей (TTL)
+и вытеснением давно не используемых записей (LRU) при переполнении.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Кэш с ограничением по размеру и времени жизни записей"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()  # ключ -> (срок_истечения, значение)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Увеличивается при каждом сбросе: значение, загруженное до сброса,
+        # не должно попасть в кэш после него
+        self._generation = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expires, value = item
+                if expires > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        """Чтение через кэш: при промахе значение загружается и сохраняется"""
+        generation = self._generation
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            with self._lock:
+                if generation == self._generation:
+                    self._store(key, value)
+        return value
+
+    def invalidate(self, *keys):
+        """Удаление конкретных ключей"""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._data.pop(key, _MISSING) is not _MISSING:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Счетчики попаданий и промахов"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
@@ -0,0 +1,128 @@
+"""
+Запуск HTTP-сервера в разных режимах обслуживания.
+
+Режимы:
+    - single: однопоточный HTTPServer (как было раньше)
+    - threaded: пул потоков фиксированного размера
+    - prefork: несколько процессов, принимающих соединения
+      с одного общего слушающего сокета
+"""
+
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer
+
+SERVE_MODES = ('single', 'threaded', 'prefork')
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP-сервер, обрабатывающий запросы в пуле потоков ограниченного размера"""
+
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, workers=8):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix='http-worker')
+
+    def process_request(self, request, client_address):
+        """Передача соединения в пул потоков вместо обработки в цикле accept"""
+        self._executor.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=False)
+
+
+def serve(handler_class, host='localhost', port=8080, mode='threaded',
+          workers=4, on_worker_start=None):
+    """
+    Запуск сервера в выбранном режиме.
+
+    args:
+        handler_class: класс обработчика запросов
+        host, port: адрес прослушивания
+        mode: один из SERVE_MODES
+        workers: число потоков (threaded) или процессов (prefork)
+        on_worker_start: функция инициализации состояния воркера
+                         (БД, контроллеры); в режиме prefork вызывается
+                         в каждом дочернем процессе после fork
+    """
+    if mode not in SERVE_MODES:
+        raise ValueError(f"Неизвестный режим сервера: {mode}")
+    if workers < 1:
+        raise ValueError("Число воркеров должно быть положительным")
+
+    if mode == 'prefork':
+        _serve_prefork(handler_class, host, port, workers, on_worker_start)
+        return
+
+    if on_worker_start:
+        on_worker_start()
+    if mode == 'threaded':
+        http = PooledHTTPServer((host, port), handler_class, workers=workers)
+    else:
+        http = HTTPServer((host, port), handler_class)
+
+    print(f'Сервер запущен на http://{host}:{port} (режим {mode}, воркеров: {workers})')
+    try:
+        http.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http.server_close()
+
+
+def _serve_prefork(handler_class, host, port, workers, on_worker_start):
+    """Pre-fork: сокет открывается в родителе, дочерние процессы делят accept"""
+    http = HTTPServer((host, port), handler_class)
+    children = set()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            # Дочерний процесс: собственные соединения с БД и контроллеры
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                if on_worker_start:
+                    on_worker_start()
+                http.serve_forever()
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    for _ in range(workers):
+        spawn()
+
+    print(f'Сервер запущен на http://{host}:{port} (режим prefork, процессов: {workers})')
+    try:
+        while children:
+            pid, _status = os.wait()
+            if pid in children:
+                # Упавший воркер перезапускается
+                children.discard(pid)
+                spawn()
+    except KeyboardInterrupt:
+        stop(signal.SIGINT, None)
+    finally:
+        http.server_close()